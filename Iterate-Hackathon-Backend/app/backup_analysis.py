@@ -8,11 +8,14 @@ frontend can consume them without transformation.
 """
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import logging
+import os
 
+import numpy as np
 import pandas as pd
 
 
@@ -33,6 +36,11 @@ def _severity_from_ratio(ratio: float) -> str:
     return "low"
 
 
+def _first_indices(df: pd.DataFrame, mask: pd.Series, n: int) -> List[Any]:
+    # Positions of the first n hits, without materialising every flagged label
+    return df.index[np.flatnonzero(mask.to_numpy())[:n]].tolist()
+
+
 def _investigation(code: str, output: Any) -> Dict[str, Any]:
     return {
         "code": code,
@@ -45,15 +53,18 @@ def _missing_product_names(dataset_id: str, df: pd.DataFrame) -> List[IssuePaylo
     if "Product" not in df.columns:
         return []
 
-    series = df["Product"].astype(str)
-    missing_mask = df["Product"].isna() | series.str.strip().isin(["", "NULL", "null"])
-    missing_indices = df.index[missing_mask].tolist()
-    missing_count = len(missing_indices)
+    # Test each distinct name once and broadcast back through the codes (-1 = NaN)
+    codes, uniques = pd.factorize(df["Product"])
+    blank = (
+        pd.Series(uniques, dtype=object).astype(str).str.strip().isin(["", "NULL", "null"]).to_numpy(dtype=bool)
+    )
+    missing_mask = pd.Series(np.append(blank, True)[codes], index=df.index)
+    missing_count = int(missing_mask.sum())
     if missing_count == 0:
         return []
 
     ratio = missing_count / max(len(df), 1)
-    sample_rows = missing_indices[:5]
+    sample_rows = _first_indices(df, missing_mask, 5)
 
     issue = {
         "id": _issue_id(dataset_id, "missing_product"),
@@ -80,9 +91,16 @@ def _missing_product_names(dataset_id: str, df: pd.DataFrame) -> List[IssuePaylo
 
 
 def _exact_duplicates(dataset_id: str, df: pd.DataFrame) -> List[IssuePayload]:
-    duplicated_mask = df.duplicated(keep=False)
-    duplicate_indices = df.index[duplicated_mask].tolist()
-    duplicate_count = len(duplicate_indices)
+    if "Sale ID" in df.columns:
+        # Identical rows share their Sale ID, so only rows with a repeated ID need the
+        # full-width row hash
+        candidates = df["Sale ID"].duplicated(keep=False).to_numpy()
+        duplicated_mask = pd.Series(False, index=df.index)
+        if candidates.any():
+            duplicated_mask[candidates] = df[candidates].duplicated(keep=False).to_numpy()
+    else:
+        duplicated_mask = df.duplicated(keep=False)
+    duplicate_count = int(duplicated_mask.sum())
     if duplicate_count == 0:
         return []
 
@@ -101,7 +119,7 @@ def _exact_duplicates(dataset_id: str, df: pd.DataFrame) -> List[IssuePayload]:
             "df.duplicated(keep=False).sum()",
             {
                 "duplicate_rows": duplicate_count,
-                "example_indices": duplicate_indices[:10],
+                "example_indices": _first_indices(df, duplicated_mask, 10),
             },
         ),
     }
@@ -113,9 +131,10 @@ def _product_whitespace(dataset_id: str, df: pd.DataFrame) -> List[IssuePayload]
         return []
 
     cleaned = df["Product"].dropna().astype(str)
-    normalized = cleaned.apply(lambda value: " ".join(value.split()))
-    mismatches = cleaned[cleaned != normalized]
-    count = len(mismatches)
+    # Same result as " ".join(value.split()), computed by the vectorized .str kernels
+    normalized = cleaned.str.replace(r"\s+", " ", regex=True).str.strip()
+    mismatch_mask = (cleaned != normalized).to_numpy()
+    count = int(np.count_nonzero(mismatch_mask))
     if count == 0:
         return []
 
@@ -134,7 +153,7 @@ def _product_whitespace(dataset_id: str, df: pd.DataFrame) -> List[IssuePayload]
             "\"Product\" column stripping comparison",
             {
                 "issue_count": count,
-                "examples": mismatches.head(5).to_dict(),
+                "examples": cleaned.iloc[np.flatnonzero(mismatch_mask)[:5]].to_dict(),
             },
         ),
     }
@@ -146,20 +165,14 @@ def _supplier_variations(dataset_id: str, df: pd.DataFrame) -> List[IssuePayload
     if column not in df.columns:
         return []
 
-    variations: List[str] = []
-    for val in df[column]:
-        if pd.isna(val):
-            continue
-        text = str(val).strip()
-        if not text:
-            continue
-        if text.lower().startswith("pharmax") and text not in {"Pharmax", "pharmax"}:
-            variations.append(text)
-
-    if not variations:
+    text = df[column].dropna().astype(str).str.strip()
+    variation_mask = text.str.lower().str.startswith("pharmax") & ~text.isin(["Pharmax", "pharmax"])
+    variations = text[variation_mask]
+
+    if variations.empty:
         return []
 
-    unique_variations = sorted(set(variations))
+    unique_variations = sorted(variations.unique().tolist())
     issue = {
         "id": _issue_id(dataset_id, "supplier_variations"),
         "type": "supplier_variations",
@@ -189,13 +202,21 @@ def _category_drift(dataset_id: str, df: pd.DataFrame) -> List[IssuePayload]:
         return []
 
     issues: List[IssuePayload] = []
-    for product, group in df.groupby("Product"):
-        if pd.isna(product):
-            continue
-
-        unique_depts = group["Dept Fullname"].dropna().unique()
-        if len(unique_depts) <= 1:
-            continue
+    # sort=False skips ordering every product; only the few drifting ones are sorted below
+    grouped = df.groupby("Product", sort=False, observed=True)
+    # One vectorized nunique finds the drifting products; only those need their rows inspected
+    dept_counts = grouped["Dept Fullname"].nunique()
+    drifting_products = dept_counts.index[dept_counts > 1].sort_values()
+    if drifting_products.empty:
+        return issues
+
+    dept_values = df["Dept Fullname"].to_numpy()
+    # Row positions per product from a single hashing pass, instead of a sub-DataFrame per group
+    product_rows = grouped.indices
+    for product in drifting_products:
+        positions = product_rows[product]
+        unique_depts = pd.unique(dept_values[positions])
+        unique_depts = unique_depts[~pd.isna(unique_depts)]
 
         dept_list = sorted(map(str, unique_depts))
         issues.append(
@@ -210,7 +231,7 @@ def _category_drift(dataset_id: str, df: pd.DataFrame) -> List[IssuePayload]:
                 "affectedColumns": ["Dept Fullname"],
                 "suggestedAction": "Select a canonical department for the product and reclassify inconsistent rows.",
                 "category": "smart_fixes",
-                "affectedRows": int(len(group)),
+                "affectedRows": int(len(positions)),
                 "temporalPattern": None,
                 "investigation": _investigation(
                     "df.groupby('Product')['Dept Fullname'].unique()",
@@ -225,33 +246,77 @@ def _category_drift(dataset_id: str, df: pd.DataFrame) -> List[IssuePayload]:
     return issues
 
 
-def _near_duplicate_rows(dataset_id: str, df: pd.DataFrame) -> List[IssuePayload]:
+def sort_rows_by_group_and_date(
+    df: pd.DataFrame,
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Order rows by (group of identical non-date columns, 'Sale Date').
+
+    Returns the row positions in that order with their group ids and datetime64
+    dates in the parsed unit, or None when 'Sale Date' is absent or cannot be
+    parsed. Group ids follow the sorted group order, so downstream pairs keep a
+    deterministic order.
+    """
     if "Sale Date" not in df.columns:
-        return []
+        return None
 
-    df_copy = df.copy()
+    # Only the date column is converted; copying the whole frame for it doubled peak memory
     try:
-        df_copy["Sale Date"] = pd.to_datetime(df_copy["Sale Date"])
+        sale_dates = pd.to_datetime(df["Sale Date"])
     except Exception:
-        return []
+        return None
+
+    cols_to_compare = [col for col in df.columns if col != "Sale Date"]
 
-    cols_to_compare = [col for col in df_copy.columns if col != "Sale Date"]
-    near_duplicate_indices: List[Tuple[int, int]] = []
+    # One group id per row and a single sort by (group, date) replace a per-group loop
+    group_ids = df.groupby(cols_to_compare, dropna=False, observed=True).ngroup().to_numpy()
+    if getattr(sale_dates.dt, "tz", None) is not None:
+        sale_dates = sale_dates.dt.tz_convert(None)
+    # Keep the parsed unit: casting to ns would silently wrap dates outside 1677-2262
+    dates = sale_dates.to_numpy()
+    order = np.lexsort((dates, group_ids))
+    return order, group_ids[order], dates[order]
 
-    for _, group in df_copy.groupby(cols_to_compare, dropna=False):
-        if len(group) < 2:
-            continue
 
-        sorted_group = group.sort_values("Sale Date")
-        diffs = sorted_group["Sale Date"].diff().dt.total_seconds().abs()
-        candidate_rows = sorted_group.index[(diffs <= 1) & (~diffs.isna())]
+def near_duplicate_mask(sorted_ids: np.ndarray, sorted_dates: np.ndarray) -> np.ndarray:
+    """
+    close[i] is True when sorted rows i and i + 1 are in the same group, both dated,
+    and at most one second apart.
+    """
+    dated = ~np.isnat(sorted_dates)
+    return (
+        (sorted_ids[1:] == sorted_ids[:-1])
+        & dated[1:]
+        & dated[:-1]
+        & (np.diff(sorted_dates) <= np.timedelta64(1, "s"))
+    )
+
+
+def find_near_duplicate_pairs(df: pd.DataFrame) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Row labels (previous, current) of rows identical on every column but 'Sale Date'
+    whose dates are at most one second apart, ordered by group then date.
+
+    Returns None when 'Sale Date' is absent or cannot be parsed. Shared with
+    tests/errors_counting_check.py so both scripts count the same pairs.
+    """
+    rows = sort_rows_by_group_and_date(df)
+    if rows is None:
+        return None
+
+    order, sorted_ids, sorted_dates = rows
+    close = near_duplicate_mask(sorted_ids, sorted_dates)
+    sorted_idx = df.index.to_numpy()[order]
+    return sorted_idx[:-1][close], sorted_idx[1:][close]
+
+
+def _near_duplicate_rows(dataset_id: str, df: pd.DataFrame) -> List[IssuePayload]:
+    pairs = find_near_duplicate_pairs(df)
+    if pairs is None:
+        return []
 
-        for idx in candidate_rows:
-            pos = list(sorted_group.index).index(idx)
-            if pos == 0:
-                continue
-            previous_idx = list(sorted_group.index)[pos - 1]
-            near_duplicate_indices.append((previous_idx, idx))
+    cols_to_compare = [col for col in df.columns if col != "Sale Date"]
+    near_duplicate_indices: List[Tuple[int, int]] = list(zip(pairs[0].tolist(), pairs[1].tolist()))
 
     if not near_duplicate_indices:
         return []
@@ -294,12 +359,20 @@ def run_backup_analysis(dataset_id: str, df: pd.DataFrame) -> Dict[str, Any]:
         _near_duplicate_rows,
     ]
 
+    # Detectors only read df, so they can share it across threads; pandas releases
+    # the GIL in most of the hashing/groupby work they do.
     issues: List[IssuePayload] = []
-    for detector in detectors:
-        try:
-            issues.extend(detector(dataset_id, df))
-        except Exception as exc:  # pragma: no cover - defensive guardrail
-            logger.exception("Backup detector %s failed", detector.__name__)
+    max_workers = min(len(detectors), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            (detector, executor.submit(detector, dataset_id, df)) for detector in detectors
+        ]
+        # Collect in submission order so the issue list stays deterministic
+        for detector, future in futures:
+            try:
+                issues.extend(future.result())
+            except Exception as exc:  # pragma: no cover - defensive guardrail
+                logger.exception("Backup detector %s failed", detector.__name__)
 
     summary = (
         f"Backup analysis complete. Found {len(issues)} issues across "
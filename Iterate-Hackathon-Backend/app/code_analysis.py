@@ -12,6 +12,7 @@ from datetime import datetime, timezone
 from typing import Any, Callable, Dict, List, Literal, Optional
 
 import anthropic
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel
 
@@ -799,11 +800,12 @@ def _get_problematic_sample(
         if issue_type == "missing_values":
             # Get rows with missing values in affected columns
             mask = df[affected_columns].isnull().any(axis=1)
-            sample = df[mask].head(max_rows)[affected_columns]
+            sample = _first_rows(df, mask, max_rows)[affected_columns]
             
         elif issue_type in ["duplicates", "near_duplicates"]:
             # Get duplicate rows
-            sample = df[df.duplicated(subset=affected_columns, keep=False)].head(max_rows)[affected_columns]
+            mask = df.duplicated(subset=affected_columns, keep=False)
+            sample = _first_rows(df, mask, max_rows)[affected_columns]
             
         elif issue_type == "whitespace":
             # Get rows with whitespace issues
@@ -811,29 +813,38 @@ def _get_problematic_sample(
             for col in affected_columns:
                 if df[col].dtype == 'object':
                     mask |= df[col].astype(str).str.strip() != df[col].astype(str)
-            sample = df[mask].head(max_rows)[affected_columns]
+            sample = _first_rows(df, mask, max_rows)[affected_columns]
             
         elif issue_type == "outliers":
-            # Get rows with outliers (using simple IQR method)
-            sample_rows = []
-            for col in affected_columns:
-                if pd.api.types.is_numeric_dtype(df[col]):
-                    Q1 = df[col].quantile(0.25)
-                    Q3 = df[col].quantile(0.75)
-                    IQR = Q3 - Q1
-                    outliers = df[(df[col] < Q1 - 1.5 * IQR) | (df[col] > Q3 + 1.5 * IQR)]
-                    sample_rows.append(outliers.head(max_rows))
-            sample = pd.concat(sample_rows).head(max_rows)[affected_columns] if sample_rows else pd.DataFrame()
+            # Get rows with outliers (simple IQR method on partition-based quartiles)
+            numeric_cols = [col for col in affected_columns if pd.api.types.is_numeric_dtype(df[col])]
+            if numeric_cols:
+                values = df[numeric_cols].to_numpy(dtype=float, na_value=np.nan)
+                Q1, Q3 = np.array(
+                    [_approx_quartiles(values[:, j]) for j in range(values.shape[1])]
+                ).T
+                IQR = Q3 - Q1
+                outlier_mask = ((values < Q1 - 1.5 * IQR) | (values > Q3 + 1.5 * IQR)).any(axis=1)
+                sample = _first_rows(df, outlier_mask, max_rows)[affected_columns]
+            else:
+                sample = pd.DataFrame()
             
         elif issue_type in ["inconsistent_categories", "category_drift", "supplier_variations"]:
             # Get rows showing variation in categorical values
             sample_rows = []
             for col in affected_columns:
                 if df[col].dtype == 'object':
-                    # Get rows with less common variations
-                    value_counts = df[col].value_counts()
-                    rare_values = value_counts[value_counts < value_counts.median()].index
-                    sample_rows.append(df[df[col].isin(rare_values)].head(max_rows))
+                    # Get rows with less common variations: histogram the factorized codes
+                    # instead of value_counts() + isin(), which hashes the column twice
+                    codes, _ = pd.factorize(df[col])
+                    observed = codes >= 0
+                    counts = np.bincount(codes[observed])
+                    if counts.size == 0:
+                        continue
+                    rare_codes = counts < np.median(counts)
+                    rare_mask = np.zeros(len(df), dtype=bool)
+                    rare_mask[observed] = rare_codes[codes[observed]]
+                    sample_rows.append(_first_rows(df, rare_mask, max_rows))
             sample = pd.concat(sample_rows).head(max_rows)[affected_columns] if sample_rows else pd.DataFrame()
             
         elif issue_type == "invalid_dates":
@@ -841,9 +852,10 @@ def _get_problematic_sample(
             sample_rows = []
             for col in affected_columns:
                 try:
-                    pd.to_datetime(df[col], errors='coerce')
-                    mask = pd.to_datetime(df[col], errors='coerce').isnull() & df[col].notnull()
-                    sample_rows.append(df[mask].head(max_rows))
+                    # Parse once: datetime parsing is by far the costliest step here
+                    parsed = pd.to_datetime(df[col], errors='coerce')
+                    mask = parsed.isnull() & df[col].notnull()
+                    sample_rows.append(_first_rows(df, mask, max_rows))
                 except Exception:
                     pass
             sample = pd.concat(sample_rows).head(max_rows)[affected_columns] if sample_rows else pd.DataFrame()
@@ -860,6 +872,33 @@ def _get_problematic_sample(
         return df.head(max_rows)[affected_columns] if affected_columns else pd.DataFrame()
 
 
+def _first_rows(df: pd.DataFrame, mask: Any, k: int) -> pd.DataFrame:
+    """
+    Return the first k rows of df where mask is True.
+
+    Locates the positions with np.flatnonzero so only those k rows are copied,
+    instead of materialising df[mask] for every flagged row first.
+    """
+    positions = np.flatnonzero(np.asarray(mask, dtype=bool))[:k]
+    return df.iloc[positions]
+
+
+def _approx_quartiles(values: np.ndarray) -> tuple[float, float]:
+    """
+    Return (Q1, Q3) of a 1-D float array, ignoring NaNs.
+
+    Uses np.partition (O(n) introselect) to pick the order statistics directly
+    instead of sorting; the nearest-rank quartiles are precise enough for IQR
+    outlier fences.
+    """
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return np.nan, np.nan
+    k1, k3 = values.size // 4, (3 * values.size) // 4
+    partitioned = np.partition(values, [k1, k3])
+    return partitioned[k1], partitioned[k3]
+
+
 def _parse_analysis_response(response_text: str, dataset_id: str) -> Dict[str, Any]:
     """Parse and validate the agent's JSON response."""
     text = response_text.strip()
@@ -2,11 +2,28 @@
 from __future__ import annotations
 
 from io import BytesIO
-from typing import Optional
+from typing import Any, Optional
 
 import pandas as pd
 
 
+def read_excel_frame(source: Any) -> pd.DataFrame:
+    """
+    Lit la première feuille d'un fichier Excel (chemin ou buffer).
+
+    - essaie d'abord le moteur calamine (Rust, bien plus rapide qu'openpyxl
+      sur les grosses feuilles) ;
+    - retombe sur le moteur par défaut si python-calamine n'est pas installé
+      ou refuse le fichier.
+    """
+    try:
+        return pd.read_excel(source, engine="calamine")
+    except (ImportError, ValueError):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return pd.read_excel(source)
+
+
 def build_excel_context(
     file_bytes: bytes,
     filename: Optional[str] = None,
@@ -19,7 +36,7 @@ def build_excel_context(
       d'exploser le contexte de l'IA).
     """
     buffer = BytesIO(file_bytes)
-    df = pd.read_excel(buffer)
+    df = read_excel_frame(buffer)
 
     # Limiter le nombre de lignes envoyées au LLM
     if len(df) > max_rows:
@@ -34,10 +51,11 @@ def build_excel_context(
     lines.append(f"Colonnes : {', '.join(map(str, col_names))}.")
     lines.append("Voici un aperçu des lignes :")
 
-    for idx, row in df.iterrows():
+    # Une seule conversion en dicts au lieu d'une Series construite par ligne (iterrows)
+    for idx, record in zip(df.index, df.to_dict(orient="records")):
         row_parts = []
         for col in col_names:
-            val = row[col]
+            val = record[col]
             if pd.isna(val):
                 continue
             row_parts.append(f"{col} = {val}")
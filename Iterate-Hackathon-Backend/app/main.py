@@ -20,7 +20,7 @@ from .dataset_store import (
     resolve_raw_path,
 )
 from .backup_analysis import run_backup_analysis
-from .excel_context import build_excel_context
+from .excel_context import build_excel_context, read_excel_frame
 from .tools import generate_error_analysis_script, format_error_report_to_json
 import pandas as pd
 from pathlib import Path
@@ -250,7 +250,7 @@ async def upload_dataset(file: UploadFile = File(...)):
     )
 
 
-def _infer_column_type(series: pd.Series) -> str:
+def _infer_column_type(series: pd.Series, unique_count: Optional[int] = None) -> str:
     if pd.api.types.is_bool_dtype(series):
         return "boolean"
     if pd.api.types.is_numeric_dtype(series):
@@ -260,7 +260,9 @@ def _infer_column_type(series: pd.Series) -> str:
     if pd.api.types.is_object_dtype(series):
         unique_ratio = 0
         try:
-            unique_ratio = series.nunique(dropna=True) / max(len(series), 1)
+            if unique_count is None:
+                unique_count = series.nunique(dropna=True)
+            unique_ratio = unique_count / max(len(series), 1)
         except Exception:
             unique_ratio = 0
         if unique_ratio <= 0.2:
@@ -268,11 +270,13 @@ def _infer_column_type(series: pd.Series) -> str:
     return "string"
 
 
-def _build_column_summary(series: pd.Series) -> ColumnSummary:
-    data_type = _infer_column_type(series)
-    total = len(series)
-    missing = int(series.isna().sum())
+def _build_column_summary(series: pd.Series, missing: Optional[int] = None) -> ColumnSummary:
+    # nunique is the expensive part: compute it once and share it with the type inference
     unique = int(series.nunique(dropna=True))
+    data_type = _infer_column_type(series, unique_count=unique)
+    total = len(series)
+    if missing is None:
+        missing = int(series.isna().sum())
     description = (
         f"Detected as {data_type}. {unique} unique values"
         f" with {missing} missing entries out of {total}."
@@ -296,10 +300,30 @@ def _load_dataframe(metadata: dict) -> pd.DataFrame:
     delimiter = metadata.get("delimiter") or ","
 
     if file_type == "excel":
-        return pd.read_excel(raw_path)
+        return read_excel_frame(raw_path)
     return pd.read_csv(raw_path, delimiter=delimiter)
 
 
+def _read_csv_preview_frame(path: Path, delimiter: str = ",") -> pd.DataFrame:
+    """
+    Read a CSV whose frame feeds the shape/head() metadata and the column names
+    handed to codegen as EXPECTED_COLUMNS.
+
+    Uses pyarrow's multithreaded reader when available. It parses ISO dates to
+    datetime64, which is fine for previews but not for _load_dataframe, whose
+    rows end up in JSON payloads. Column names always come from the C engine:
+    pyarrow leaves a blank header as '' and keeps duplicate headers as-is, where
+    pandas gives 'Unnamed: 0' and 'a.1', the names every other loader sees.
+    """
+    columns = pd.read_csv(path, delimiter=delimiter, nrows=0).columns
+    try:
+        df = pd.read_csv(path, delimiter=delimiter, engine="pyarrow")
+    except (ImportError, ValueError):
+        return pd.read_csv(path, delimiter=delimiter)
+    df.columns = columns
+    return df
+
+
 def _persist_analysis_result(dataset_dir: Path, result: AnalysisResultResponse) -> None:
     analysis_path = dataset_dir / "analysis.json"
     analysis_path.write_text(result.model_dump_json(indent=2), encoding="utf-8")
@@ -574,11 +598,14 @@ async def get_dataset_understanding(dataset_id: str, force_refresh: bool = False
 
     # Fallback: Heuristic-based understanding
     logger.info(f"Using heuristic understanding for {dataset_id}")
-    columns = [_build_column_summary(df[col]) for col in df.columns]
+    missing_counts = df.isna().sum()
+    columns = [
+        _build_column_summary(df[col], missing=int(missing_counts[col]))
+        for col in df.columns
+    ]
 
-    missing_counts = df.isna().sum().sort_values(ascending=False)
     observations: List[str] = []
-    for col, count in missing_counts.head(3).items():
+    for col, count in missing_counts.sort_values(ascending=False).head(3).items():
         if count > 0:
             observations.append(f"{col} contient {int(count)} valeurs manquantes")
 
@@ -1080,10 +1107,10 @@ async def upload_and_analyze(
 
     # 2) Charger avec pandas pour récupérer les colonnes + metadata
     if suffix in [".xlsx", ".xls"]:
-        df = pd.read_excel(dataset_path)
+        df = read_excel_frame(dataset_path)
         effective_file_type = "excel"
     else:
-        df = pd.read_csv(dataset_path, delimiter=delimiter)
+        df = _read_csv_preview_frame(dataset_path, delimiter)
         effective_file_type = "csv"
 
     column_names = df.columns.tolist()
@@ -1163,7 +1190,7 @@ def chat_dataset(payload: ChatDatasetRequest):
         )
 
     # 2) Charger avec pandas pour récupérer les colonnes + metadata
-    df = pd.read_csv(dataset_path)
+    df = _read_csv_preview_frame(dataset_path)
     effective_file_type = "csv"
 
     column_names = df.columns.tolist()
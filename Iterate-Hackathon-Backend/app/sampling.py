@@ -76,18 +76,13 @@ def prepare_sample_rows(
     """
     sample_df = df.head(max_rows)
     
-    # Convert to dict, handling NaN values
-    rows = []
-    for _, row in sample_df.iterrows():
-        row_dict = {}
-        for col in df.columns:
-            val = row[col]
+    # Convert to dicts in one pass (no per-row Series), handling NaN values
+    rows = sample_df.to_dict(orient="records")
+    for row_dict in rows:
+        for col, val in row_dict.items():
             # Convert NaN to None for JSON serialization
             if pd.isna(val):
                 row_dict[col] = None
-            else:
-                row_dict[col] = val
-        rows.append(row_dict)
     
     return rows
 
@@ -75,17 +75,84 @@ Generate a complete Python script (a single file) that:
 
 3. Contains:
    - an import block:
+       import os
        import sys
-       from typing import List
+       from dataclasses import dataclass
+       from typing import Any, Dict, List
+       import numpy as np
        import pandas as pd
 
    - a global variable EXPECTED_COLUMNS = [ ... ] with EXACTLY the provided column names
+   - a global variable NUMERIC_COLS = [ ... ] listing the numeric-like columns among them
+     (prices, amounts, quantities, rates, ids stored as numbers)
+   - a global variable NUMERIC_ID_COLS = [ ... ] listing the integer identifiers among
+     NUMERIC_COLS (ids, codes and barcodes stored as numbers); the rest of NUMERIC_COLS are
+     measures
+   - a global variable CATEGORY_COLS = [ ... ] listing the repeated, low-cardinality text columns
+     (branches, departments, groups, codes); never a column already in NUMERIC_COLS
+   - a global variable PANDAS_NA_VALUES holding pandas' default NA strings, used by every
+     loader so a cell is null or not whichever one read the file:
+       PANDAS_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+                           '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+                           'n/a', 'nan', 'null']
+   - these globals, together with every other dataset-specific constant introduced below
+     (ID columns, DUP_KEY, DATE_FORMATS, thresholds), form ONE configuration block at the top
+     of the script. Every column a check refers to by role gets a constant there too, e.g.
+       DATE_COL = 'Sale Date'; DRIFT_CATEGORY_COL = 'Dept Fullname'
+       TURNOVER_COL = 'Turnover'; TURNOVER_EX_VAT_COL = 'Turnover ex VAT'
+     Check functions read column names only from that block or from ctx, never from string
+     literals in their bodies, so scripts generated for datasets with the same layout differ
+     only in that block and the check code is identical between them. Column names quoted in
+     the specs and snippets below ('Sale Date', 'Dept Fullname', ...) show what those constants
+     hold for this kind of dataset; they are never copied into a check body as literals.
 
    - a function load_dataset(file_path: str) -> pd.DataFrame
        - if file_type = "excel":
-             df = pd.read_excel(file_path)
+             try:
+                 df = pd.read_excel(file_path, engine="calamine")
+             except (ImportError, ValueError):
+                 df = pd.read_excel(file_path)
          otherwise if "csv":
-             df = pd.read_csv(file_path, delimiter={repr(delimiter)})
+             try:
+                 from pyarrow import csv as pacsv
+                 table = pacsv.read_csv(
+                     file_path,
+                     read_options=pacsv.ReadOptions(use_threads=True, block_size=64 << 20),
+                     parse_options=pacsv.ParseOptions(delimiter={repr(delimiter)}),
+                     convert_options=pacsv.ConvertOptions(null_values=PANDAS_NA_VALUES,
+                                                          strings_can_be_null=True),
+                 )
+                 df = table.to_pandas()
+             except (ImportError, ValueError):
+                 try:
+                     df = pd.read_csv(file_path, delimiter={repr(delimiter)}, low_memory=False,
+                                      dtype={{c: "float64" for c in NUMERIC_COLS
+                                             if c not in NUMERIC_ID_COLS}})
+                 except ValueError:
+                     df = pd.read_csv(file_path, delimiter={repr(delimiter)}, low_memory=False)
+       - on the C engine, the dtype hint parses the measure columns straight into float64
+         arrays instead of object arrays re-coerced later; a stray non-numeric value makes it
+         raise, and the re-read without hints keeps that column as text so check_basic_types
+         can report it. Never add na_values beyond PANDAS_NA_VALUES ('$', '-', 'unknown', ...)
+         to make a column parse (pd.read_csv already applies that list by default): that would
+         hide exactly the values the type checks must report. pyarrow already infers numeric
+         columns natively and needs no hints. NUMERIC_ID_COLS get no hint: left to inference,
+         both loaders read them as int64 (float64 only when the column has blanks), so an id
+         prints as 6376470 whichever loader ran, and ids above 2**53 keep every digit
+       - pyarrow's default null_values lack 'None' and '<NA>', so without PANDAS_NA_VALUES those
+         cells would stay text and a numeric column holding them would load as strings;
+         strings_can_be_null=True applies the list to text columns too, as pd.read_csv does
+       - pyarrow's CSV reader scans delimiters with SIMD and converts columns on several
+         threads, much faster than the default engine on large files; 64 MiB blocks keep every
+         thread busy. Fall back to the C engine when pyarrow is not installed (pyarrow raises
+         ArrowInvalid, a ValueError subclass, on malformed input)
+       - the calamine engine (python-calamine, Rust) parses .xlsx several times faster than
+         openpyxl; fall back to the default engine when it is not installed
+       - keep the default dtype backend (no dtype_backend="pyarrow"): numeric columns stay
+         NumPy float64/int64 arrays. Text columns load as object on pandas 2 and as the 'str'
+         dtype on pandas 3; the checks must accept both (test text columns with
+         pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s),
+         never dtype == object)
 
 
    - a function check_missing_values(df) that:
@@ -151,18 +218,19 @@ Generate a complete Python script (a single file) that:
        * the function must:
            - identify products whose category varies across rows
            - group rows by product identifier (e.g., product_code, product_name)
-           - check if 'Dept Fullname' changes over time or between transactions
+           - check if DRIFT_CATEGORY_COL (e.g. 'Dept Fullname') changes over time or between
+             transactions
        * messages MUST include examples with row indices, category values AND a category prefix, e.g.:
            "[CATEGORY_DRIFT] WARNING: Category drift detected for product 'ExputexCoughSyrup200ml': categories found ['OTC' (rows [12, 18]), 'OTC:Cold&Flu' (rows [33, 41])]."
-       * if a date column exists (e.g., 'Sale Date'), the function should mention timing, if relevant.
+       * if DATE_COL exists (e.g., 'Sale Date'), the function should mention timing, if relevant.
 
 
    - a function check_near_duplicate_rows(df) that:
        * detects “near-duplicate” rows where all columns are identical
-         EXCEPT for 'Sale Date', which differs by ±1 second.
+         EXCEPT for DATE_COL (e.g. 'Sale Date'), which differs by ±1 second.
        * the function must:
            - compare rows after temporarily rounding / normalizing datetime columns
-           - identify pairs/groups of rows that match all columns except Sale Date
+           - identify pairs/groups of rows that match all columns except DATE_COL
            - ensure the date-time difference is ≤ 1 second
        * messages MUST include example row indices, timestamps AND a category prefix, e.g.:
            "[NEAR_DUPLICATE] WARNING: Near-duplicate rows detected: rows [22, 23] differ only by Sale Date (2024-05-01 12:00:01 vs 2024-05-01 12:00:02)."
@@ -192,6 +260,351 @@ Generate a complete Python script (a single file) that:
            - [DUPLICATE_ROWS] ERROR: There are 5 duplicate rows. Example rows: [10, 11, 58].
          etc.
 
+4. Performance requirements
+---------------------------
+The script runs on the FULL dataset (potentially millions of rows), not on the sample above:
+   - statistical checks are skipped on tiny frames, where their fixed per-column overhead
+     dominates and the statistic itself is meaningless: with MIN_ROWS_FOR_STATS = 50 in the
+     configuration block, check_outliers and the rarity thresholds of check_allowed_categories
+     start with `if len(ctx.df) < MIN_ROWS_FOR_STATS: return []`. Rule-based checks (missing
+     values, duplicates, ranges, id consistency) always run, whatever the row count.
+   - check_outliers (if added) must get the quartiles with an O(n) selection, not a sort:
+       arr = numeric[col].to_numpy(dtype=float); arr = arr[~np.isnan(arr)]
+       k1, k3 = arr.size // 4, (3 * arr.size) // 4
+       part = np.partition(arr, [k1, k3]); q1, q3 = part[k1], part[k3]
+     (skip empty columns). Then flag all columns in ONE broadcast over the stacked values:
+       values = ctx.matrix[:, [ctx.matrix_cols.index(c) for c in cols]]
+       iqr = q3 - q1                        # 1-D arrays, one entry per column
+       out = (values < q1 - 3 * iqr) | (values > q3 + 3 * iqr)
+       counts = out.sum(axis=0); rows_j = np.flatnonzero(out[:, j])[:N_FAILURES] if counts[j]
+     Never call .quantile(0.25) / .quantile(0.75) separately per column, and never build a
+     boolean Series just to count outliers.
+     numba is OPTIONAL, like polars below (try: from numba import njit, prange / except
+     ImportError: njit = None). When it imports, the quartile selection for all columns may run
+     in one kernel over the stacked values, parallel across columns:
+       @njit(cache=True, parallel=True)
+       def _quartiles(values):             # (n_rows, n_cols) float64, NaN = missing
+           q = np.full((2, values.shape[1]), np.nan)
+           for j in prange(values.shape[1]):
+               col = values[:, j]; col = col[~np.isnan(col)]
+               if col.size:
+                   q[0, j] = np.partition(col, col.size // 4)[col.size // 4]
+                   q[1, j] = np.partition(col, (3 * col.size) // 4)[(3 * col.size) // 4]
+           return q
+     and the flagging broadcast above stays unchanged. Without numba, use the NumPy loop; both
+     paths must give the same quartiles and the same report.
+   - summarize_dataset(df) must be called exactly ONCE in main(); keep its returned list and reuse it
+     both for the report and for printing. Compute the numeric statistics with a single
+     pd.DataFrame(ctx.numeric).agg(['min', 'max', 'mean', 'median']) call over the cached
+     coerced columns, never one .min()/.max()/.mean() per column, and the distinct counts of
+     the categorical columns with one df[cat_cols].nunique(); then only format the small
+     result frames.
+   - check_allowed_categories must count categories from integer codes, not Python objects, and
+     never call value_counts() (it sorts every category by count when only the rare tail matters):
+       codes = df[col].cat.codes.to_numpy(); uniques = df[col].cat.categories   (CATEGORY_COLS)
+       codes, uniques = pd.factorize(df[col])                                     (other columns)
+       counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+     apply the rarity thresholds (e.g. count < 3 or count < total * 0.001) on the counts array,
+     and map back with rare_idx = np.flatnonzero(rare); rare_names = uniques[rare_idx].
+     The example row of every category comes from the same codes, in one pass:
+       pos = np.flatnonzero(codes >= 0)
+       _, first = np.unique(codes[pos], return_index=True); first_pos = pos[first]
+       example_rows = df.index[first_pos[rare_idx]]
+     never from df[df[col] == category].index per rare category (one full scan each).
+     When the only rule is "exactly one occurrence", skip the counts and the first-position
+     lookup: a singleton's single row is its example, so one hash pass gives both,
+       single_pos = np.flatnonzero((~df[col].duplicated(keep=False) & df[col].notna()).to_numpy())
+       for i in single_pos[:MAX_MESSAGES_PER_CHECK]: value, row = df[col].iat[i], df.index[i]
+   - repeated text columns used as categories or grouping keys (e.g. 'Branch Name', 'Dept Fullname',
+     'Group Fullname', 'OrderList', 'Barcode', 'Headoffice ID') are converted ONCE in main(),
+     right after loading and before any check runs:
+       for c in CATEGORY_COLS:
+           if c not in present_cols:
+               continue
+           s = df[c]
+           is_text = pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s)
+           if is_text and s.nunique() < len(df) // 2:
+               df[c] = s.astype('category')
+     (text columns only, object on pandas 2 or 'str' on pandas 3 — a plain dtype == object test
+     never matches on pandas 3 — and only when values repeat: a per-row identifier such as
+     'Sale ID' gains nothing from a category table as large as the column itself)
+     so value counts and groupby keys hash integer codes instead of Python strings. Group them
+     with groupby(c, observed=True, sort=False). Repeated product names ('Product') also
+     belong in CATEGORY_COLS when they repeat across transactions (nunique < half the rows):
+     .str methods on a categorical run once per distinct value. Truly free-text columns
+     (descriptions, comments) stay plain strings.
+   - EVERY groupby call passes sort=False and observed=True (sort only the few result rows
+     that are reported, if order matters): the default sort costs O(g log g) over millions of
+     ids, and observed=False on categorical keys materialises empty groups.
+   - check_* functions must never mutate df, so main() can run them concurrently:
+       from concurrent.futures import ThreadPoolExecutor
+       with ThreadPoolExecutor(max_workers=min(8, len(checks), os.cpu_count() or 1)) as ex:
+           futures = [ex.submit(check, ctx) for check in checks]
+       then collect future.result() in submission order so the report stays deterministic.
+     checks is the list of ALL check_* functions (columns, missing values, duplicates, types,
+     ranges, categories, uniqueness, id consistency, dates, business rules, outliers...); the
+     shared CheckContext is read-only and fully built (numeric cache, validity masks, dates,
+     arrays) in main() BEFORE the pool starts; workers never fill caches lazily
+     (no numeric.setdefault(...) from inside a check), so no locking is needed. The work is
+     memory-bound, so more than 8 threads only adds contention.
+   - a date column that already arrives as datetime64 (pyarrow parses ISO timestamps while
+     reading the CSV) is used as-is; do not pass it through pd.to_datetime again.
+   - date columns (e.g. 'Sale Date') must be parsed ONCE, in main(), with an explicit format:
+       fmt = pd.tseries.api.guess_datetime_format(first_non_null_value)
+     if no format is guessed, pick the first of DATE_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d',
+     '%d/%m/%Y %H:%M:%S', '%d/%m/%Y', '%m/%d/%Y %H:%M:%S', 'ISO8601'] that parses the first
+     1000 non-null values without NaT, then parse the full column once:
+       dates = pd.to_datetime(df[col], format=fmt, errors='coerce', cache=True)
+     and only if that leaves most non-null values as NaT, retry ONCE with format='mixed'.
+     Store the parsed Series in ctx.dates[col] (add `dates: Dict[str, pd.Series]` to
+     CheckContext) for every check that needs it (never call pd.to_datetime on the same column
+     twice, and never parse without a format). "Now" is read once in main(),
+     NOW = pd.Timestamp.now(), not inside each check.
+   - future/implausible date checks compare the raw datetime64 array against bounds built
+     ONCE in main() next to NOW, instead of comparing Python datetime objects row by row or
+     materialising a dates.dt.year Series:
+       NOW64 = np.datetime64(NOW); OLDEST64 = NOW64 - np.timedelta64(3650, 'D')
+       arr = dates.to_numpy()
+       future = arr > NOW64; too_old = arr < OLDEST64      # NaT compares False in both
+   - check_missing_values builds every null mask in ONE pass and reduces it once,
+       na_mat = df[present].isna()   # present = [c for c in EXPECTED_COLUMNS if c in present_cols]
+       counts = na_mat.sum(axis=0)
+     and only for columns with counts[col] > 0 takes
+     rows = first_k_rows(df.index, na_mat[col].to_numpy()), reusing the mask instead of calling
+     df[col].isna() a second time.
+   - every check block starts with a scalar preflight and skips clean columns before building
+     any examples; .tolist(), .index[...] and df.loc[mask, col] only run inside the branch that
+     reports a problem. When the message needs the count anyway, walk the mask ONCE on the
+     NumPy view and test the count:
+       mask_arr = mask.to_numpy(); count = int(np.count_nonzero(mask_arr))
+       if not count: continue
+     (never `if mask.any():` followed by `mask.sum()`, which walks the mask twice); use
+     np.any(mask_arr) alone only when no count is reported.
+   - define N_FAILURES = 3 at module level and cap every list of example values/rows with it
+     (every snippet in this prompt does; never a literal 3 or 5).
+     Take examples by position from a NumPy mask instead of slicing a filtered Series:
+       mask = (numeric[col] < 0).to_numpy(); count = int(np.count_nonzero(mask))
+       idx = np.flatnonzero(mask)[:N_FAILURES]
+       values = numeric[col].to_numpy()[idx].tolist(); rows = df.index[idx].tolist()
+     Wrap the row part in one helper used by every check (missing values, duplicates, ranges,
+     financial consistency, outliers, dates) and never write df[mask].index.tolist()[:N_FAILURES]:
+       def first_k_rows(index, mask, k=N_FAILURES):
+           return index[np.flatnonzero(np.asarray(mask, dtype=bool))[:k]].tolist()
+     and, when a message shows both offending values and their rows, compute the positions
+     ONCE and read both from them (never numeric_col[mask].tolist()[:N_FAILURES], which copies
+     every flagged value first):
+       def first_k_examples(index, values, mask, k=N_FAILURES):
+           idx = np.flatnonzero(np.asarray(mask, dtype=bool))[:k]
+           return np.asarray(values)[idx].tolist(), index[idx].tolist()
+   - check_value_ranges tests every quantity/price column for negatives in ONE 2-D operation:
+       cols = [c for c in quantity_cols + price_cols if c in ctx.numeric]
+       arr = ctx.matrix[:, [ctx.matrix_cols.index(c) for c in cols]]
+       neg = arr < 0                        # NaN compares False, no separate notna mask
+       neg_counts = neg.sum(axis=0)
+     and only for columns j with neg_counts[j] > 0 take rows = np.flatnonzero(neg[:, j])[:N_FAILURES].
+   - business-rule / financial-consistency checks (e.g. turnover < turnover ex VAT) work on
+     NumPy arrays, not chained Series comparisons plus a DataFrame slice:
+       t = numeric[TURNOVER_COL].to_numpy(); tev = numeric[TURNOVER_EX_VAT_COL].to_numpy()
+       mask = np.less(t, tev, where=~(np.isnan(t) | np.isnan(tev)), out=np.zeros(t.shape, dtype=bool))
+       count = int(np.count_nonzero(mask))
+     and rows are fetched with df.iloc[np.flatnonzero(mask)[:N_FAILURES]] only if count > 0.
+     All business rules are evaluated together in ONE helper that reads each array once and
+     returns a uint8 bit field (one bit per rule, NaN comparisons are False):
+       RULES = ['TRADE_PRICE_ABOVE_RRP', 'TURNOVER_BELOW_EX_VAT', 'ZERO_QTY_WITH_TURNOVER',
+                'PROFIT_ABOVE_EX_VAT', 'VAT_MISMATCH']
+       flags = np.zeros(n, dtype=np.uint8)
+       flags |= (tp > rrp).astype(np.uint8) << 0
+       flags |= (t < tev).astype(np.uint8) << 1   ... and so on for each rule present
+       flags |= (np.abs(t - tev - va) > 0.02).astype(np.uint8) << 4   # VAT_MISMATCH
+     where every operand is a plain ndarray taken once with ctx.numeric[c].to_numpy(), c being
+     a config-block constant (TRADE_PRICE_COL, RRP_COL, TURNOVER_COL, VAT_COL, ...): no
+     Series arithmetic (turnover_ex_vat + vat_amount, abs(turnover - ...)) that re-aligns
+     indexes and allocates a Series per step.
+     All per-rule counts then come from ONE pass over the bit field instead of one sum per rule:
+       combos = np.bincount(flags, minlength=256); codes = np.arange(256)
+       counts = {{rule: int(combos[(codes >> k) & 1 == 1].sum()) for k, rule in enumerate(RULES)}}
+       rows_with_any_issue = len(flags) - int(combos[0])
+     and a rule's examples are read from np.flatnonzero((flags >> k) & 1)[:N_FAILURES] only if
+     its count is > 0.
+     Relative-tolerance rules (e.g. turnover vs RRP x quantity) are written without division,
+     so zero quantities need no separate mask and NaNs compare False:
+       expected = rrp * qty
+       bad = np.abs(t - expected) > TOLERANCE_PCT * np.abs(expected)
+     If numexpr is importable (try/except ImportError, optional), the same expression may be
+     evaluated with numexpr.evaluate('abs(t - rrp * qty) > tol * abs(rrp * qty)', local_dict=...).
+   - polars is an OPTIONAL accelerator, never a requirement. Import it as
+       try:
+           import polars as pl
+       except ImportError:
+           pl = None
+     and, for CSV input when pl is not None, compute every per-column reduction needed by
+     check_missing_values and summarize_dataset (null counts, n_unique, min, max, mean) in ONE
+     lazy query that scans the file once:
+       try:
+           stats = pl.scan_csv(file_path, separator=..., null_values=PANDAS_NA_VALUES,
+                               infer_schema_length=None).select(
+               [pl.col(c).null_count().alias(f"{{c}}__nulls") for c in EXPECTED_COLUMNS]
+               + [pl.col(c).drop_nulls().n_unique().alias(f"{{c}}__nunique") for c in EXPECTED_COLUMNS]
+               + [...]
+           ).collect()
+       except (pl.exceptions.PolarsError, OSError):
+           stats = None   # use the pandas path for every check
+     (Polars only treats empty fields as null, so without PANDAS_NA_VALUES 'NA' or 'NULL'
+     cells would count as values and the null counts would disagree with pandas.
+     infer_schema_length=None infers each column's type from all rows, not the first 100, so
+     a late non-numeric value cannot make the scan fail halfway; if it still fails, e.g. on a
+     ragged line pandas tolerates, the numbers come from pandas. n_unique counts null as a
+     value while pandas' nunique() does not, hence drop_nulls() first.)
+     The same select also carries the scalar counts that decide whether the remaining checks
+     have anything to report, so Polars plans them as one parallel pass over each column:
+       (pl.col(c) < 0).sum().alias(f"{{c}}__neg")                          # negative quantities
+       pl.col(c).is_duplicated().sum().alias(f"{{c}}__dups")               # uniqueness, one column
+       pl.struct(DUP_KEY).is_duplicated().sum().alias("dup_key__dups")     # duplicates on DUP_KEY
+       (pl.col(c).n_unique().over(id_col) > 1).sum().alias(f"{{id_col}}__{{c}}__conflicts")  # id consistency
+     Every expression gets its own alias: unaliased ones are named after their input column, so
+     two counts over the same column collide in one select. pl.col(DUP_KEY) with a list expands
+     to one expression per column and tests each column alone; pl.struct(DUP_KEY) tests the
+     composite key, matching df.duplicated(subset=DUP_KEY). The uniqueness count stays on a
+     single column (c is one id column that must be unique on its own, e.g. 'Sale ID').
+     A check whose count is 0 is skipped without touching the pandas frame; only checks with
+     a non-zero count build their example rows from pandas as described above. All other
+     checks, and every check when pl or stats is None, use the pandas DataFrame; the report
+     text must be identical whichever path produced the numbers.
+   - CSV files larger than LARGE_FILE_BYTES = 512 * 1024 * 1024 (os.path.getsize) must not be
+     loaded whole. main() then streams them with
+       pd.read_csv(file_path, delimiter=..., chunksize=200_000, low_memory=False)
+     and runs only the checks whose result can be combined across chunks: per-column counters
+     (missing values, non-numeric values, out-of-range values), running min/max/sum for the
+     summary, rare-category counts summed per value, and exact duplicates through a set of
+     pd.util.hash_pandas_object(chunk, index=False) row hashes. Keep at most N_FAILURES
+     examples per check, with row indices offset by the rows already read. Checks that need
+     every row at once (near duplicates, id consistency, category drift) are skipped and
+     reported as one "[SKIPPED] INFO: ..." line.
+     Write each streamable check as a small accumulator class with update(chunk, offset) and
+     finalize() -> List[str] (e.g. MissingAccumulator keeps per-column null counts and the
+     first N_FAILURES row indices; NegativeAccumulator the same for values < 0;
+     FinancialAccumulator the count of inconsistent rows). The chunk size defaults to 200_000
+     and can be overridden with the DETECT_ERRORS_CHUNKSIZE environment variable, so the
+     command line keeps exactly one argument.
+   - a check never formats an unbounded number of messages: define MAX_MESSAGES_PER_CHECK = 20
+     and, once a check (e.g. one message per rare category or per inconsistent id) reaches it,
+     stop building f-strings and append a single summary line such as
+       "[RARE_CATEGORY] INFO: 312 more rare categories in 'Branch Name' not listed."
+     Every check still runs to completion, so no issue category disappears from the report.
+   - example values must be sampled with a bounded amount of work: take the first distinct
+     offending values with pd.unique(df.loc[bad_mask, col].head(1000))[:N_FAILURES], never
+     list(set(all_bad_values))[:N_FAILURES] (which builds the full set first).
+   - compute present_cols = frozenset(df.columns) once in main() and, in each check, iterate over
+     [c for c in EXPECTED_COLUMNS if c in present_cols] instead of testing `col in df.columns`
+     inside loops.
+   - numeric-like columns must be coerced ONCE, in a dedicated helper called right after loading:
+       def coerce_numeric_columns(df, cols) -> Dict[str, pd.Series]:
+           return {{c: df[c] if pd.api.types.is_numeric_dtype(df[c]) else pd.to_numeric(df[c], errors='coerce')
+                   for c in cols}}
+       numeric = coerce_numeric_columns(df, [c for c in NUMERIC_COLS if c in present_cols])
+     and the result is shared with every check that needs numbers (check_basic_types,
+     check_value_ranges, check_outliers, financial/business-logic checks, summarize_dataset);
+     pd.to_numeric appears nowhere else in the script. Checks read numeric[col]
+     and never call pd.to_numeric themselves; columns that are already numeric are reused as-is,
+     and check_basic_types skips every column whose dtype is not object/string.
+     Before coercing a whole text column, probe it cheaply:
+       probe = df[c].dropna().head(1024)
+       parsed = pd.to_numeric(probe, errors='coerce').notna().mean() if len(probe) else 0.0
+     if fewer than half of the probe values parse, the column is text, not a numeric column
+     with stray values: leave it out of numeric (no full coercion, no per-value type warnings).
+     A clean probe does NOT prove a clean column, so numeric-like columns are still coerced in
+     full.
+     Next to it, main() keeps the validity mask of each cached column,
+       valid = {{c: numeric[c].notna().to_numpy() for c in numeric}},
+     so range, outlier and business-rule checks reuse it instead of calling .notna()/.dropna()
+     on the same column again. main() bundles this shared, read-only state in one object:
+       @dataclass(frozen=True)
+       class CheckContext:
+           df: pd.DataFrame
+           numeric: Dict[str, pd.Series]
+           valid: Dict[str, np.ndarray]
+           arrays: Dict[str, np.ndarray]
+           matrix: np.ndarray        # float64, shape (rows, len(matrix_cols))
+           matrix_cols: List[str]
+           indices: Dict[str, Dict[Any, np.ndarray]]
+     where matrix = np.column_stack([numeric[c].to_numpy(dtype=float) for c in matrix_cols]),
+     matrix_cols = list(numeric), is stacked ONCE; range, outlier and business-rule checks
+     slice its columns (ctx.matrix[:, ctx.matrix_cols.index(c)]) instead of stacking again,
+     and every check_* function takes that single ctx argument (the check_*(df) signatures of
+     section 3 become check_*(ctx) and read ctx.df).
+   - main() also extracts the column arrays ONCE, arrays = {{c: df[c].to_numpy() for c in present_cols}},
+     and checks build their masks from arrays[col] (and numeric[col].to_numpy()) instead of
+     slicing df with df[mask] / df.loc[mask] for every test. A check keeps only
+     np.flatnonzero(mask)[:N_FAILURES] positions; full rows are read back through df.iloc[...]
+     only for the errors that are actually reported.
+   - check_basic_types must never loop over values calling float() inside try/except; the
+     non-numeric entries of a column are the ones the cached coercion turned into NaN:
+       bad_mask = numeric[col].isna() & df[col].notna()
+       if not bad_mask.any(): continue
+     and only then sample examples from df.loc[bad_mask, col] and their row indices.
+   - check_id_consistency must not iterate `for key, group in df.groupby(id_col)`; find the
+     inconsistent keys with ONE vectorized aggregation over all checked attributes:
+       gb = df.groupby(id_col, sort=False, observed=True, dropna=True)   # ONE per id column
+       nun = gb[attrs].nunique()
+     (attrs = every consistency column present except id_col; reuse the same gb for
+     transform('first') and gb.indices rather than regrouping per attribute)
+       bad = nun[(nun > 1).any(axis=1)]        # every attribute filtered at once
+       bad_keys = bad.index[:N_FAILURES]
+     and only fetch example values for those few keys (bad.loc[key] tells which attributes
+     conflict, so no per-key or per-attribute rescans). When only the first conflicting
+     attribute per id is reported, take it from the matrix instead of a loop with break:
+       first_attr = np.asarray(attrs)[(bad.to_numpy() > 1).argmax(axis=1)]
+     Never use groupby(...)[col].apply(lambda x: x.dropna().unique()) or any per-group Python
+     callback. The conflicting values of one bad id, with the first row of each, come from its
+     row positions only:
+       pos = ctx.indices[id_col][bad_id]
+       ex = pd.Series(ctx.arrays[attr][pos], index=df.index[pos]).dropna().drop_duplicates()
+       ex = ex.head(N_FAILURES)
+       # ex.tolist() -> values, ex.index.tolist() -> their first rows
+     When the offending ROWS are needed (row counts, example rows), flag them per attribute
+     without any Python-level loop:
+       first = gb[attr].transform('first')
+       diff_mask = (df[attr] != first) & df[attr].notna() & df[id_col].notna()
+       bad_ids = pd.unique(df.loc[diff_mask, id_col].head(1000))[:N_FAILURES]
+   - when examples are needed for many offending keys (e.g. barcodes with conflicting products),
+     build the row lookup once with
+       positions = df.groupby(key, sort=False, observed=True).indices
+     and read df[col].to_numpy()[positions[value]]; never rescan with df[df[key] == value] per key.
+   - check_duplicates hashes the rows exactly ONCE: either a single df.duplicated(keep=False)
+     mask reused for the count and the example rows, or, when duplicate groups are reported,
+       codes = df.groupby(list(df.columns), dropna=False, sort=False, observed=True).ngroup().to_numpy()
+       counts = np.bincount(codes); dup_mask = counts[codes] > 1
+     with rows = int(dup_mask.sum()), groups = int((counts > 1).sum()) and example rows
+     first_k_rows(df.index, dup_mask), all from that one hash pass; never follow
+     duplicated() with drop_duplicates()/value_counts() or df[dup_mask].duplicated() over the
+     same rows.
+     On transactional data, first narrow the rows with a short composite key of int/category
+     columns, e.g. DUP_KEY = ['Sale ID', 'Barcode', 'Sale Date', 'Branch Name']:
+       key = [c for c in DUP_KEY if c in present_cols]
+       candidates = df.duplicated(subset=key, keep=False) if key else slice(None)
+     and run the full-row hash only on df[candidates]; rows identical on every column are
+     identical on the key, so the result is unchanged while far fewer bytes are hashed.
+   - single-column uniqueness checks (e.g. 'Sale ID', 'Barcode') must not materialise a full
+     duplicated(keep=False) mask; count instead:
+       arr = df[col].to_numpy(); arr = arr[~pd.isna(arr)]
+       vals, counts = np.unique(arr, return_counts=True); dup = counts > 1
+       extra_rows = int(counts[dup].sum() - dup.sum())
+       examples = vals[dup][:N_FAILURES].tolist()
+     and, only when extra_rows > 0, the rows of those example values from one lookup. Use
+     ctx.indices[col] when the column has one; otherwise group ONLY the duplicated rows:
+       dup_pos = np.flatnonzero((df[col].duplicated(keep=False) & df[col].notna()).to_numpy())
+       groups = df.iloc[dup_pos].groupby(col, sort=False, observed=True).indices
+       rows = df.index[dup_pos[groups[value][:N_FAILURES]]].tolist()
+     never df[df[col] == dup_val] per duplicated value.
+   - when several checks look up rows by the same key column (uniqueness, rare categories,
+     id consistency on 'Barcode' / 'Headoffice ID' / CATEGORY_COLS), main() builds the lookup
+     ONCE per column, before the thread pool starts, and stores it in the CheckContext:
+       indices = {{c: df.groupby(c, sort=False, observed=True).indices for c in LOOKUP_COLS}}
+     so every check reads df.index[ctx.indices[col][value][:N_FAILURES]] instead of
+     re-hashing the column.
+   - main() must buffer the report lines in a list and emit them with a single
+     sys.stdout.write('\\n'.join(lines) + '\\n') instead of one print() per message.
+
 5. Freedom to add additional functions
 ---------------------------------------
 The LLM is allowed (and encouraged) to:
@@ -351,6 +764,22 @@ Contraintes / spécifications
    - pas de f-string cassée
    - toutes les variables utilisées doivent être définies
 
+5. Performance (le script tourne sur le dataset COMPLET, potentiellement des millions de lignes) :
+   - aucune boucle Python ligne par ligne (pas de df.iloc[idx] ni de row["col"] dans un for) :
+     les corrections sont des opérations vectorisées sur des colonnes entières
+   - pour remplir une colonne à partir d'une clé (ex : 'Product' depuis 'Barcode'), construire
+     la table de correspondance UNE seule fois sur les lignes valides, sans df.copy(), puis
+     l'appliquer uniquement aux lignes manquantes avec .map :
+       valid = df[key].notna() & ~missing_mask
+       lookup = ...  # une Series indexée par la clé, calculée sur df.loc[valid, [key, col]]
+       df.loc[missing_mask, col] = df.loc[missing_mask, key].map(lookup)
+   - cette table n'est calculée que si missing_mask.any() ; sinon la correction est sautée.
+     La valeur la plus fréquente par clé se calcule sans lambda Python (pas de
+     .agg(lambda x: x.value_counts().index[0]) ni de .mode() par groupe) :
+       counts = df.loc[valid].groupby([key, col], sort=False, observed=True).size()
+       lookup = counts.sort_values(ascending=False, kind="stable").reset_index()
+       lookup = lookup.drop_duplicates(key).set_index(key)[col]
+
 Format de sortie
 ----------------
 RENVOIE UNIQUEMENT le code Python du fichier complet.
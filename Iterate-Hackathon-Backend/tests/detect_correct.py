@@ -10,11 +10,12 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
 from app.backup_analysis import run_backup_analysis  # noqa: E402
+from app.excel_context import read_excel_frame  # noqa: E402
 
 
 def load_dataset(file_path: Path) -> pd.DataFrame:
     if file_path.suffix.lower() in {".xlsx", ".xls"}:
-        return pd.read_excel(file_path)
+        return read_excel_frame(file_path)
     return pd.read_csv(file_path, delimiter=",")
 
 
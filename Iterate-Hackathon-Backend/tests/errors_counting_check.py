@@ -1,13 +1,67 @@
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 import re
+from pathlib import Path
+from typing import List
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from app.backup_analysis import (  # noqa: E402
+    find_near_duplicate_pairs,
+    near_duplicate_mask,
+    sort_rows_by_group_and_date,
+)
+from app.excel_context import read_excel_frame  # noqa: E402
+
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+# Repeated text columns: a few thousand distinct values over millions of rows
+CATEGORY_COLUMNS = ["Product", "OrderList", "Dept Fullname", "Barcode", "Branch Name", "Group Fullname"]
 
 
 def load_dataset(path: str) -> pd.DataFrame:
     if path.endswith(".xlsx") or path.endswith(".xls"):
-        return pd.read_excel(path)
-    return pd.read_csv(path, delimiter=",")
+        return read_excel_frame(path)
+    # pyarrow's multithreaded reader when available, default C engine otherwise
+    try:
+        return pd.read_csv(path, delimiter=",", engine="pyarrow")
+    except (ImportError, ValueError):
+        return pd.read_csv(path, delimiter=",")
+
+
+def prepare_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the repeated text columns to category once, so hashing, grouping and
+    equality tests run on integer codes instead of Python strings, and parse
+    Sale Date once for the date-based checks.
+    """
+    for c in CATEGORY_COLUMNS:
+        if c in df.columns and (pd.api.types.is_object_dtype(df[c]) or pd.api.types.is_string_dtype(df[c])):
+            df[c] = df[c].astype("category")
+
+    # Parse Sale Date once with the fast ISO parser; the checks' own pd.to_datetime calls are
+    # then no-ops. Anything else stays as text so those calls keep their original behaviour.
+    if "Sale Date" in df.columns:
+        try:
+            df["Sale Date"] = pd.to_datetime(df["Sale Date"], format="ISO8601")
+        except (ValueError, TypeError):
+            pass
+    return df
+
+
+def category_codes(col: pd.Series):
+    """
+    Integer codes (-1 = missing) and distinct values as strings, so string checks
+    run once per distinct value and are broadcast back through the codes.
+    """
+    if not isinstance(col.dtype, pd.CategoricalDtype):
+        col = col.astype("category")
+    return col.cat.codes.to_numpy(), pd.Series(col.cat.categories.astype(str))
 
 
 # 1. Missing Product Names
@@ -19,9 +73,10 @@ def count_missing_product_names(df: pd.DataFrame) -> int:
     if "Product" not in df.columns:
         return 0
 
-    prod_str = df["Product"].astype(str)
-    mask = df["Product"].isna() | prod_str.str.strip().isin(["", "NULL", "null"])
-    return int(mask.sum())
+    codes, values = category_codes(df["Product"])
+    blank = values.str.strip().isin(["", "NULL", "null"]).to_numpy()
+    # Missing rows plus rows whose value is blank/NULL
+    return int((codes < 0).sum() + np.bincount(codes[codes >= 0], minlength=len(values))[blank].sum())
 
 
 # 2. Exact Duplicate Rows
@@ -35,12 +90,23 @@ def count_exact_duplicates(df: pd.DataFrame) -> dict:
         "duplicate_groups": number of duplicate groups (unique row patterns),
       }
     """
-    # Mask of all rows that have at least one duplicate elsewhere
-    dup_mask = df.duplicated(keep=False)
-    rows_involved = int(dup_mask.sum())
+    if "Sale ID" in df.columns:
+        # Identical rows share their Sale ID: hash full rows only where the ID repeats
+        df = df[df["Sale ID"].duplicated(keep=False).to_numpy()]
+
+    if df.empty:
+        return {"rows_involved": 0, "duplicate_groups": 0}
+
+    # One hash pass: size of every distinct row pattern (NaN compares equal,
+    # as in df.duplicated)
+    sizes = df.groupby(list(df.columns), dropna=False, sort=False, observed=True).size()
+    dup_sizes = sizes[sizes > 1]
+
+    # Rows that have at least one duplicate elsewhere
+    rows_involved = int(dup_sizes.sum())
 
     # Number of unique duplicate patterns (each group counted once)
-    dup_groups = df[dup_mask].drop_duplicates().shape[0]
+    dup_groups = int(len(dup_sizes))
 
     return {
         "rows_involved": rows_involved,
@@ -59,48 +125,50 @@ def count_near_duplicates(df: pd.DataFrame) -> dict:
         "rows_involved": number of distinct rows in those pairs
       }
     """
-    if "Sale Date" not in df.columns:
-        return {"pairs": 0, "rows_involved": 0}
-
-    df_copy = df.copy()
-
-    try:
-        df_copy["Sale Date"] = pd.to_datetime(df_copy["Sale Date"])
-    except Exception:
+    pairs = find_near_duplicate_pairs(df)
+    if pairs is None:
         return {"pairs": 0, "rows_involved": 0}
 
-    cols_no_date = [c for c in df_copy.columns if c != "Sale Date"]
-
-    near_dupe_pairs = []
-    rows_set = set()
-
-    grouped = df_copy.groupby(cols_no_date, dropna=False)
-
-    for _, group in grouped:
-        if len(group) < 2:
-            continue
-
-        group_sorted = group.sort_values("Sale Date")
-        times = group_sorted["Sale Date"]
-        diffs = times.diff().dt.total_seconds().abs()
-
-        candidate_indices = group_sorted.index[diffs <= 1]
+    prev_rows, rows = pairs
+    return {
+        "pairs": int(len(rows)),
+        "rows_involved": int(len(np.union1d(prev_rows, rows))),
+    }
 
-        for idx in candidate_indices:
-            sorted_idx = list(group_sorted.index)
-            pos = sorted_idx.index(idx)
-            if pos == 0:
-                continue
-            prev_idx = sorted_idx[pos - 1]
 
-            near_dupe_pairs.append((prev_idx, idx))
-            rows_set.add(prev_idx)
-            rows_set.add(idx)
+# 2 + 3. Exact and near duplicates from one pass
+def count_duplicate_rows(df: pd.DataFrame):
+    """
+    Exact and near duplicate stats, as count_exact_duplicates / count_near_duplicates.
+    When Sale Date is already parsed (prepare_dataset), both come from a single sort of
+    the rows by (identical non-date columns, Sale Date) instead of two groupbys over
+    every column: exact duplicates are then consecutive rows with the same group and date.
+    """
+    if "Sale Date" not in df.columns or not pd.api.types.is_datetime64_any_dtype(df["Sale Date"]):
+        return count_exact_duplicates(df), count_near_duplicates(df)
+
+    order, sorted_ids, sorted_dates = sort_rows_by_group_and_date(df)
+
+    # NaT matches NaT, as in groupby(dropna=False)
+    undated = np.isnat(sorted_dates)
+    same_row = (sorted_ids[1:] == sorted_ids[:-1]) & (
+        (sorted_dates[1:] == sorted_dates[:-1]) | (undated[1:] & undated[:-1])
+    )
+    # A duplicate group starts wherever a run of identical rows begins
+    group_starts = same_row & ~np.concatenate(([False], same_row[:-1]))
+    dup_groups = int(np.count_nonzero(group_starts))
+    dup_stats = {
+        "rows_involved": int(np.count_nonzero(same_row)) + dup_groups,
+        "duplicate_groups": dup_groups,
+    }
 
-    return {
-        "pairs": len(near_dupe_pairs),
-        "rows_involved": len(rows_set),
+    close = near_duplicate_mask(sorted_ids, sorted_dates)
+    sorted_idx = df.index.to_numpy()[order]
+    near_stats = {
+        "pairs": int(np.count_nonzero(close)),
+        "rows_involved": int(len(np.union1d(sorted_idx[:-1][close], sorted_idx[1:][close]))),
     }
+    return dup_stats, near_stats
 
 
 # 4. Extra Whitespace in Product Names
@@ -114,20 +182,10 @@ def count_product_whitespace_errors(df: pd.DataFrame) -> int:
     if "Product" not in df.columns:
         return 0
 
-    col = df["Product"]
-
-    def has_whitespace_issue(x: str) -> bool:
-        if x is None or pd.isna(x):
-            return False
-        s = str(x)
-        if s != s.strip():
-            return True
-        if "  " in s:  # double space
-            return True
-        return False
-
-    mask = col.apply(has_whitespace_issue)
-    return int(mask.sum())
+    # Test each distinct name once, then count its rows
+    codes, values = category_codes(df["Product"])
+    bad = ((values != values.str.strip()) | values.str.contains("  ", regex=False)).to_numpy()  # double space
+    return int(np.bincount(codes[codes >= 0], minlength=len(values))[bad].sum())
 
 
 # 5. Supplier Name Variations (Pharmax drift)
@@ -161,38 +219,18 @@ def count_pharmax_variations(df: pd.DataFrame) -> dict:
             "by_value": {},
         }
 
-    col = df[supplier_col]
-
-    pharmax_mask = []
-    canonical_mask = []
-
-    norm_values = []
-
-    for val in col:
-        if pd.isna(val):
-            norm_values.append(None)
-            pharmax_mask.append(False)
-            canonical_mask.append(False)
-            continue
-
-        original = str(val)
-        normalized = re.sub(r"\s+", " ", original).strip()
-        lower = normalized.lower()
-        norm_values.append(normalized)
+    # Normalize each distinct supplier once, then broadcast to the rows through the codes
+    codes, values = category_codes(df[supplier_col])
+    normalized = values.str.replace(_WHITESPACE_RUN, " ", regex=True).str.strip().to_numpy()
+    # Extra trailing False so that missing rows (code -1) are never in the family
+    in_family = np.append(pd.Series(normalized).str.lower().str.startswith("pharmax").to_numpy(), False)
+    fam_values = pd.Series(normalized[codes[in_family[codes]]])
 
-        is_pharmax_family = lower.startswith("pharmax")
-        pharmax_mask.append(is_pharmax_family)
-        canonical_mask.append(is_pharmax_family and normalized == "Pharmax")
-
-    pharmax_mask = pd.Series(pharmax_mask, index=df.index)
-    canonical_mask = pd.Series(canonical_mask, index=df.index)
-
-    pharmax_total = int(pharmax_mask.sum())
-    canonical_pharmax = int(canonical_mask.sum())
+    pharmax_total = int(len(fam_values))
+    canonical_pharmax = int((fam_values == "Pharmax").sum())
     variations = pharmax_total - canonical_pharmax
 
     # Count by actual supplier value for pharmax-family rows
-    fam_values = pd.Series(norm_values)[pharmax_mask]
     by_value = fam_values.value_counts().to_dict()
 
     return {
@@ -225,7 +263,13 @@ def count_category_drift(df: pd.DataFrame) -> dict:
 
     total_rows = int(sub.shape[0])
 
-    by_dept = sub["Dept Fullname"].value_counts().to_dict()
+    depts = sub["Dept Fullname"]
+    if isinstance(depts.dtype, pd.CategoricalDtype):
+        # Only the departments actually present, in first-seen order on ties
+        depts = depts.astype(depts.cat.categories.dtype)
+    sub = sub.assign(**{"Dept Fullname": depts})
+
+    by_dept = depts.value_counts().to_dict()
 
     before = {}
     after = {}
@@ -264,69 +308,81 @@ def main():
     except Exception as e:
         print(f"Error loading dataset: {e}")
         sys.exit(1)
-
-    print("=== DATASET INFO ===")
-    print(f"Shape: {df.shape[0]} rows x {df.shape[1]} columns\n")
+    df = prepare_dataset(df)
+
+    # Same thread fan-out as run_backup_analysis. prepare_dataset() has already done every
+    # conversion, so no counter writes to df; keep this list in the order of the unpacking below.
+    counters = [
+        count_missing_product_names,
+        count_duplicate_rows,
+        count_product_whitespace_errors,
+        count_pharmax_variations,
+        count_category_drift,
+    ]
+    with ThreadPoolExecutor(max_workers=min(len(counters), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(counter, df) for counter in counters]
+    missing_prod, (dup_stats, near_stats), ws_count, pharmax_stats, cat_stats = [f.result() for f in futures]
+
+    # Buffer the report and write it in one go rather than one print() per line
+    out: List[str] = []
+    out.append("=== DATASET INFO ===")
+    out.append(f"Shape: {df.shape[0]} rows x {df.shape[1]} columns\n")
 
     # 1) Missing Product Names
-    missing_prod = count_missing_product_names(df)
-    print("1) Missing Product Names")
-    print(f"   → rows with missing/blank/NULL Product: {missing_prod} (doc says: 1133)")
-    print()
+    out.append("1) Missing Product Names")
+    out.append(f"   → rows with missing/blank/NULL Product: {missing_prod} (doc says: 1133)")
+    out.append("")
 
     # 2) Exact Duplicate Rows
-    dup_stats = count_exact_duplicates(df)
-    print("2) Exact Duplicate Rows")
-    print(f"   → rows involved in exact duplicates: {dup_stats['rows_involved']} (doc says: 14 rows)")
-    print(f"   → number of duplicate groups (unique duplicated patterns): {dup_stats['duplicate_groups']} "
-          f"(doc says: 6 exact duplicates)")
-    print()
+    out.append("2) Exact Duplicate Rows")
+    out.append(f"   → rows involved in exact duplicates: {dup_stats['rows_involved']} (doc says: 14 rows)")
+    out.append(f"   → number of duplicate groups (unique duplicated patterns): {dup_stats['duplicate_groups']} "
+               f"(doc says: 6 exact duplicates)")
+    out.append("")
 
     # 3) Near Duplicate Rows
-    near_stats = count_near_duplicates(df)
-    print("3) Near Duplicate Rows")
-    print(f"   → near-duplicate pairs (±1 second): {near_stats['pairs']} (doc says: 14 pairs)")
-    print(f"   → distinct rows involved: {near_stats['rows_involved']} (doc says: 28 rows)")
-    print()
+    out.append("3) Near Duplicate Rows")
+    out.append(f"   → near-duplicate pairs (±1 second): {near_stats['pairs']} (doc says: 14 pairs)")
+    out.append(f"   → distinct rows involved: {near_stats['rows_involved']} (doc says: 28 rows)")
+    out.append("")
 
     # 4) Extra Whitespace in Product Names
-    ws_count = count_product_whitespace_errors(df)
-    print("4) Extra Whitespace in Product Names")
-    print(f"   → rows with Product whitespace issues: {ws_count} (doc says: 3338)")
-    print()
+    out.append("4) Extra Whitespace in Product Names")
+    out.append(f"   → rows with Product whitespace issues: {ws_count} (doc says: 3338)")
+    out.append("")
 
     # 5) Supplier Name Variations (Pharmax drift)
-    pharmax_stats = count_pharmax_variations(df)
-    print("5) Supplier Name Variations (Pharmax drift)")
-    print(f"   → total 'Pharmax' family rows (any variant): {pharmax_stats['pharmax_total']} "
-          f"(doc says: 9,979 total Pharmax records)")
-    print(f"   → canonical 'Pharmax': {pharmax_stats['canonical_pharmax']}")
-    print(f"   → variations (non-exact 'Pharmax'): {pharmax_stats['variations']} "
-          f"(doc says: 4,587 modified rows from April 1)")
-    print("   → breakdown by supplier value for Pharmax-family:")
+    out.append("5) Supplier Name Variations (Pharmax drift)")
+    out.append(f"   → total 'Pharmax' family rows (any variant): {pharmax_stats['pharmax_total']} "
+               f"(doc says: 9,979 total Pharmax records)")
+    out.append(f"   → canonical 'Pharmax': {pharmax_stats['canonical_pharmax']}")
+    out.append(f"   → variations (non-exact 'Pharmax'): {pharmax_stats['variations']} "
+               f"(doc says: 4,587 modified rows from April 1)")
+    out.append("   → breakdown by supplier value for Pharmax-family:")
     for val, cnt in pharmax_stats["by_value"].items():
-        print(f"      - {val!r}: {cnt}")
-    print()
+        out.append(f"      - {val!r}: {cnt}")
+    out.append("")
 
     # 7) Category Drift (ExputexCoughSyrup200ml)
-    cat_stats = count_category_drift(df)
-    print("7) Category Drift (ExputexCoughSyrup200ml)")
-    print(f"   → total rows for ExputexCoughSyrup200ml: {cat_stats['total_rows']} "
-          f"(doc suggests: 273 + 740 = 1013)")
-    print("   → by Dept Fullname (all dates):")
+    out.append("7) Category Drift (ExputexCoughSyrup200ml)")
+    out.append(f"   → total rows for ExputexCoughSyrup200ml: {cat_stats['total_rows']} "
+               f"(doc suggests: 273 + 740 = 1013)")
+    out.append("   → by Dept Fullname (all dates):")
     for dept, cnt in cat_stats["by_dept"].items():
-        print(f"      - {dept!r}: {cnt}")
+        out.append(f"      - {dept!r}: {cnt}")
 
     if cat_stats["before_2024_04_01"] or cat_stats["from_2024_04_01"]:
-        print("   → before 2024-04-01 (expected: OTC ~273):")
+        out.append("   → before 2024-04-01 (expected: OTC ~273):")
         for dept, cnt in cat_stats["before_2024_04_01"].items():
-            print(f"      - {dept!r}: {cnt}")
+            out.append(f"      - {dept!r}: {cnt}")
 
-        print("   → from 2024-04-01 (expected: OTC:Cold&Flu ~740):")
+        out.append("   → from 2024-04-01 (expected: OTC:Cold&Flu ~740):")
         for dept, cnt in cat_stats["from_2024_04_01"].items():
-            print(f"      - {dept!r}: {cnt}")
+            out.append(f"      - {dept!r}: {cnt}")
+
+    out.append("\n(Discount Context Loss intentionally ignored in this script.)")
 
-    print("\n(Discount Context Loss intentionally ignored in this script.)")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":